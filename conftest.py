@@ -0,0 +1,84 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# The agent and its tools are imported as top-level modules from src/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+# room name -> (category, title, content, year) memories seeded for the tests
+SEED_MEMORIES = {
+    "test_room": [
+        (
+            "hobbies",
+            "Gardening",
+            "My favorite hobbies are gardening and knitting sweaters.",
+            "",
+        ),
+        (
+            "education",
+            "Graduation",
+            "I graduated from Lincoln High School in Springfield.",
+            "1950",
+        ),
+        (
+            "career",
+            "Teaching",
+            "I worked as a schoolteacher and taught third grade for thirty years.",
+            "",
+        ),
+        (
+            "family",
+            "Our children",
+            "Robert and I raised three children: Wesley, Susan and Mary.",
+            "",
+        ),
+    ],
+    "default_user": [
+        (
+            "family",
+            "Our wedding",
+            "Robert and I got married on June 12, 1955 at St. Mary's Church. "
+            "I wore my mother's lace wedding dress.",
+            "1955",
+        ),
+        (
+            "childhood",
+            "The farm",
+            "I grew up on a dairy farm in Iowa with two brothers.",
+            "",
+        ),
+    ],
+}
+
+
+@pytest.fixture(scope="session")
+def memory_tools(tmp_path_factory):
+    """One MemoryTools, and its ChromaDB client, shared by the whole session.
+
+    Its store lives in a temp directory seeded with SEED_MEMORIES.
+    """
+    from tools.memory_tool import MemoryTools
+
+    tools = MemoryTools(storage_dir=str(tmp_path_factory.mktemp("user_memories")))
+    for room_name, memories in SEED_MEMORIES.items():
+        tools._get_collection(room_name).add(
+            documents=[content for _, _, content, _ in memories],
+            metadatas=[
+                {"category": category, "title": title, "year": year}
+                for category, title, _, year in memories
+            ],
+            ids=[f"{room_name}-{i}" for i in range(len(memories))],
+        )
+    return tools
+
+
+@pytest.fixture
+def mock_context():
+    """Build a stand-in RunContext whose room has the given name."""
+
+    def make(room_name: str = "default_user"):
+        return SimpleNamespace(room=SimpleNamespace(name=room_name))
+
+    return make
@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import logging
 
 from dotenv import load_dotenv
@@ -8,90 +10,80 @@ from livekit.agents import (
     JobProcess,
     MetricsCollectedEvent,
     RoomInputOptions,
+    RunContext,
     WorkerOptions,
     cli,
-    metrics,
     function_tool,
-    RunContext,
+    metrics,
 )
-from livekit.plugins import groq, noise_cancellation, silero
+from livekit.plugins import elevenlabs, groq, noise_cancellation, silero
 
-# Import memory tools - make sure this matches your file name
-from tools.memory_tool import MemoryTools  # Changed to memory_tools (plural)
-from tools.twilio_tool import TwilioTool
 from tools.emergency_tool import EmergencyTool
 from tools.mailjet_tool import MailjetTool
-from livekit.plugins import elevenlabs
+from tools.memory_tool import MemoryTools
+from tools.twilio_tool import TwilioTool
 
 logger = logging.getLogger("agent")
 
 load_dotenv(".env.local")
 
+# Shared by every session so the prompt prefix is identical across turns
+INSTRUCTIONS = """You are Heather, a warm companion for Maggie (Margaret), a 92-year-old woman with dementia. You are the younger Maggie, who set this up for her future self.
+
+Talk like a caring friend: short replies (1-2 sentences), warm, light, a little playful. Ask follow-up questions and never make her feel tested. Don't use tools unless needed.
+
+About Maggie: born in Brooklyn in 1932; married Robert (died 2007); taught elementary school for 38 years; children Susan, Michael, Patricia and Wesley; grandchildren and great-grandchildren; loves yellow roses, gardening, reading and quilting.
+
+Calls: use make_phone_call when she asks to call someone. Family members (Wesley, Susan, Michael, Patricia) need her consent first; when she confirms, use confirm_call_consent. Save numbers she gives with add_phone_contact; use list_contacts when she asks who she can call.
+
+Emergencies: if she says "help", "emergency", "I fell" or anything urgent, use emergency_call immediately; use call_911 only if she asks for 911. Be urgent and reassuring, then gently ask what happened, whether she's hurt, where she is and how she feels. If she can't answer, keep reassuring her that help is coming."""
+
+
+def _is_blank(value: str | None) -> bool:
+    """True when the LLM passed no usable value for a tool argument."""
+    return not value or value.isspace()
+
+
+def _memory_query_tool(name: str, query: str, description: str):
+    """Build a tool that searches Maggie's memories with a fixed query."""
+
+    async def tool(self, context: RunContext):
+        return await self.memory_tools.search_memories(context, query)
+
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = description
+    return function_tool(tool)
+
 
 class Assistant(Agent):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        memory_tools: MemoryTools | None = None,
+        twilio_tool: TwilioTool | None = None,
+        emergency_tool: EmergencyTool | None = None,
+        mailjet_tool: MailjetTool | None = None,
+    ) -> None:
         super().__init__(
-            instructions="""You are Heather, a warm and caring conversation companion for Heather, a 92-year-old woman with dementia.
-            In reality, your her replica and the younger version of her. You knew you were diagnosed with dementia so you told yourself in the future this is for you.
-
-            IMPORTANT: Have normal conversations. Do NOT use any tools or functions unless absolutely necessary. Just talk naturally.
-
-            Your conversation style:
-            - Talk like a caring friend having a natural chat
-            - Keep responses SHORT - 1-2 sentences usually, like natural speech
-            - Be warm, encouraging, and never make her feel tested
-            - Ask follow-up questions to keep the conversation flowing
-            - Make some jokes and keep things light and fun
-
-            What you know about Maggie (use naturally in conversation):
-            - Born in Brooklyn in 1932 during the Great Depression
-            - Was married to Robert who she loved dearly (he passed away in 2007)
-            - Taught elementary school for 38 years, loved helping kids learn to read
-            - Has four children: Susan, Michael, Patricia, and Wesley
-            - Has grandchildren and great-grandchildren
-            - Loves yellow roses, gardening, reading, and quilting
-
-                   Phone calling capabilities:
-                   - If Maggie asks to call someone (like "call Wesley" or "I want to talk to Wesley"), use make_phone_call
-                   - For family members (Wesley, Susan, Michael, Patricia), you'll first ask for consent before calling
-                   - If Maggie confirms she wants to call a family member, use confirm_call_consent
-                   - If Maggie gives you a phone number, use add_phone_contact to save it
-                   - If Maggie asks who she can call, use list_contacts
-
-                   Emergency capabilities:
-                   - If Maggie says "help", "emergency", "I need help", "I fell", or similar urgent phrases, IMMEDIATELY use emergency_call
-                   - If Maggie specifically asks to call 911, use call_911
-                   - Emergency calls go to Wesley first, then other family members
-                   - Always respond with urgency and reassurance during emergencies
-                   - After calling for help, have a natural conversation with Maggie about what happened
-                   - The system will automatically send an email with conversation details after 10 seconds
-                   - Ask questions like "What happened?", "Are you hurt?", "Where are you?", "How are you feeling?"
-                   - If Maggie can't answer or seems confused, use skip_emergency_questions to send basic alert
-
-
-                   Just have a normal conversation. Only use functions when Maggie specifically asks to call someone, manage contacts, or needs emergency help.""",
+            instructions=INSTRUCTIONS,
         )
-        # Initialize memory tools
-        self.memory_tools = MemoryTools()
-        # Initialize Twilio tool
-        self.twilio_tool = TwilioTool()
-        # Initialize emergency tool
-        self.emergency_tool = EmergencyTool()
-        # Initialize Mailjet tool
-        self.mailjet_tool = MailjetTool()
+        # Reuse the tools built in prewarm when given, otherwise create our own
+        self.memory_tools = memory_tools or MemoryTools()
+        self.twilio_tool = twilio_tool or TwilioTool()
+        self.emergency_tool = emergency_tool or EmergencyTool()
+        self.mailjet_tool = mailjet_tool or MailjetTool()
 
     # Memory tools for helping Maggie remember
     @function_tool
     async def search_memories(self, context: RunContext, topic: str):
         """Search through Maggie's stored memories about a specific topic."""
-        if not topic or topic is None or topic.strip() == "":
+        if _is_blank(topic):
             return "I'd love to hear about your memories. What would you like to talk about?"
         return await self.memory_tools.search_memories(context, topic)
 
     @function_tool
     async def search_memories_by_age(self, context: RunContext, age: str):
         """Search for memories from when Maggie was a specific age."""
-        if not age or age is None or age.strip() == "":
+        if _is_blank(age):
             return "What age would you like to talk about?"
         return await self.memory_tools.search_memories(
             context, f"when I was {age} years old"
@@ -102,31 +94,26 @@ class Assistant(Agent):
         """Get Maggie's basic personal information."""
         return await self.memory_tools.get_personal_info(context)
 
-    @function_tool
-    async def get_family_info(self, context: RunContext):
-        """Get information about Maggie's family members."""
-        return await self.memory_tools.search_memories(
-            context, "family children grandchildren"
-        )
-
-    @function_tool
-    async def get_teaching_memories(self, context: RunContext):
-        """Get memories about Maggie's teaching career."""
-        return await self.memory_tools.search_memories(
-            context, "teaching school classroom students"
-        )
-
-    @function_tool
-    async def get_childhood_memories(self, context: RunContext):
-        """Get memories from Maggie's childhood in Brooklyn."""
-        return await self.memory_tools.search_memories(
-            context, "childhood Brooklyn growing up"
-        )
+    get_family_info = _memory_query_tool(
+        "get_family_info",
+        "family children grandchildren",
+        "Get information about Maggie's family members.",
+    )
+    get_teaching_memories = _memory_query_tool(
+        "get_teaching_memories",
+        "teaching school classroom students",
+        "Get memories about Maggie's teaching career.",
+    )
+    get_childhood_memories = _memory_query_tool(
+        "get_childhood_memories",
+        "childhood Brooklyn growing up",
+        "Get memories from Maggie's childhood in Brooklyn.",
+    )
 
     @function_tool
     async def get_wisdom(self, context: RunContext, topic: str = ""):
         """Get Maggie's wisdom and reflections on life topics."""
-        if not topic or topic is None or topic.strip() == "":
+        if _is_blank(topic):
             return await self.memory_tools.search_memories(
                 context, "wisdom advice life lessons"
             )
@@ -144,13 +131,13 @@ class Assistant(Agent):
     async def make_phone_call(
         self, context: RunContext, contact_name: str, message: str = ""
     ):
-        """Make a phone call to a contact when Maggie asks to call someone.
+        """Call a contact when Maggie asks to call someone.
 
         Args:
-            contact_name: Name of the person to call (e.g., "wesley", "susan", "doctor")
+            contact_name: Who to call, e.g. "wesley" or "doctor"
             message: Optional message to say when they answer
         """
-        if not contact_name or contact_name.strip() == "":
+        if _is_blank(contact_name):
             return "Who would you like me to call?"
         return await self.twilio_tool.make_phone_call(context, contact_name, message)
 
@@ -162,14 +149,14 @@ class Assistant(Agent):
         consent_given: bool,
         message: str = "",
     ):
-        """Confirm consent to call a family member when Maggie responds to consent request.
+        """Call a family member once Maggie answers the consent question.
 
         Args:
-            contact_name: Name of the person to call
-            consent_given: Whether consent is given (true/false)
+            contact_name: Who to call
+            consent_given: Whether Maggie agreed
             message: Optional message to say when they answer
         """
-        if not contact_name or contact_name.strip() == "":
+        if _is_blank(contact_name):
             return "Who are you giving consent to call?"
         return await self.twilio_tool.confirm_call_consent(
             context, contact_name, consent_given, message
@@ -179,19 +166,19 @@ class Assistant(Agent):
     async def add_phone_contact(
         self, context: RunContext, name: str, phone_number: str
     ):
-        """Add a new contact to the phone book when Maggie gives you someone's number.
+        """Save a contact when Maggie gives you someone's number.
 
         Args:
-            name: Name of the person
-            phone_number: Their phone number (include country code, e.g., +1234567890)
+            name: Contact name
+            phone_number: Number with country code, e.g. +1234567890
         """
-        if not name or not phone_number:
+        if _is_blank(name) or _is_blank(phone_number):
             return "I need both a name and phone number to add a contact."
         return await self.twilio_tool.add_phone_contact(context, name, phone_number)
 
     @function_tool
     async def list_contacts(self, context: RunContext):
-        """List all available contacts when Maggie asks who she can call."""
+        """List who Maggie can call."""
         return await self.twilio_tool.list_contacts(context)
 
     # Emergency tools for safety
@@ -199,11 +186,11 @@ class Assistant(Agent):
     async def emergency_call(
         self, context: RunContext, emergency_type: str = "general", message: str = ""
     ):
-        """Call for emergency help when Maggie needs assistance.
+        """Call family for help in an emergency.
 
         Args:
-            emergency_type: Type of emergency (general, medical, fall, urgent)
-            message: Additional message about the emergency
+            emergency_type: general, medical, fall or urgent
+            message: What is happening
         """
         return await self.emergency_tool.emergency_call(
             context, emergency_type, message
@@ -211,10 +198,10 @@ class Assistant(Agent):
 
     @function_tool
     async def call_911(self, context: RunContext, emergency_description: str = ""):
-        """Call 911 emergency services directly.
+        """Call 911 directly.
 
         Args:
-            emergency_description: Description of the emergency
+            emergency_description: What is happening
         """
         return await self.emergency_tool.call_911(context, emergency_description)
 
@@ -226,14 +213,14 @@ class Assistant(Agent):
         phone_number: str,
         priority: str = "secondary",
     ):
-        """Add a new emergency contact.
+        """Add an emergency contact.
 
         Args:
-            name: Name of the emergency contact
+            name: Contact name
             phone_number: Their phone number
-            priority: Priority level (primary, secondary, doctor)
+            priority: primary, secondary or doctor
         """
-        if not name or not phone_number:
+        if _is_blank(name) or _is_blank(phone_number):
             return "I need both a name and phone number to add an emergency contact."
         return await self.emergency_tool.add_emergency_contact(
             context, name, phone_number, priority
@@ -245,53 +232,14 @@ class Assistant(Agent):
         return await self.emergency_tool.list_emergency_contacts(context)
 
 
-    @function_tool
-    async def complete_emergency_report(self, context: RunContext):
-        """Complete the emergency report and send it."""
-        return await self.emergency_tool.complete_emergency_report(context)
-    
-    @function_tool
-    async def skip_emergency_questions(self, context: RunContext):
-        """Skip remaining emergency questions and send basic report immediately."""
-        return await self.emergency_tool.skip_emergency_questions(context)
-    
-    @function_tool
-    async def send_emergency_report(self, context: RunContext, what_happened: str):
-        """Send an emergency report based on what Maggie told you in conversation.
-        
-        Args:
-            what_happened: What Maggie told you happened (from your conversation with her)
-        """
-        return await self.emergency_tool.send_emergency_report_from_conversation(context, what_happened)
-    
-    @function_tool
-    async def store_emergency_conversation(self, context: RunContext, speaker: str, message: str):
-        """Store emergency conversation data and auto-send email if ready.
-        
-        Args:
-            speaker: Who is speaking (Heather or Maggie)
-            message: What was said
-        """
-        # Store the conversation
-        self.emergency_tool.store_emergency_conversation(speaker, message)
-        
-        # Check if we should auto-send the email
-        email_sent = await self.emergency_tool.auto_send_emergency_email_if_ready(context)
-        
-        if email_sent:
-            return f"I've stored what you said and sent a detailed emergency report to your family. Help should be on the way soon."
-        else:
-            return f"I've noted what you said. Can you tell me more about what happened?"
-    
-    @function_tool
-    async def send_emergency_email_now(self, context: RunContext):
-        """Send emergency email immediately with all conversation data"""
-        return await self.emergency_tool.send_emergency_email_now(context)
-
-
-
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    # Build the tools once per process so their clients are ready before the
+    # first session instead of being recreated for every Assistant
+    proc.userdata["memory_tools"] = MemoryTools()
+    proc.userdata["twilio_tool"] = TwilioTool()
+    proc.userdata["emergency_tool"] = EmergencyTool()
+    proc.userdata["mailjet_tool"] = MailjetTool()
 
 
 async def entrypoint(ctx: JobContext):
@@ -314,10 +262,8 @@ async def entrypoint(ctx: JobContext):
         ),
         # Text-to-speech (TTS) is your agent's voice, turning the LLM's text into speech that the user can hear
         # See all available models as well as voice selections at https://docs.livekit.io/agents/models/tts/
-        tts=elevenlabs.TTS(
-            voice_id="8ib9KsbkLqVPusGKvcDb",
-            model="eleven_multilingual_v2"
-        ),
+        # The agent only speaks English, so use the low-latency Flash model
+        tts=elevenlabs.TTS(voice_id="8ib9KsbkLqVPusGKvcDb", model="eleven_flash_v2_5"),
         # See more at https://docs.livekit.io/agents/build/turns
         turn_detection="stt",  # Use STT endpointing instead of the complex multilingual model
         vad=ctx.proc.userdata["vad"],
@@ -339,13 +285,32 @@ async def entrypoint(ctx: JobContext):
     # Metrics collection, to measure pipeline performance
     # For more information, see https://docs.livekit.io/agents/build/metrics/
     usage_collector = metrics.UsageCollector()
+    # Metrics are logged from a background task so formatting them never runs
+    # inside the pipeline's event callback
+    pending_metrics: asyncio.Queue[metrics.AgentMetrics] = asyncio.Queue(maxsize=1024)
 
     @session.on("metrics_collected")
     def _on_metrics_collected(ev: MetricsCollectedEvent):
-        metrics.log_metrics(ev.metrics)
         usage_collector.collect(ev.metrics)
+        # Drop metrics rather than block the pipeline if logging falls behind
+        with contextlib.suppress(asyncio.QueueFull):
+            pending_metrics.put_nowait(ev.metrics)
+
+    def flush_metrics():
+        while not pending_metrics.empty():
+            metrics.log_metrics(pending_metrics.get_nowait())
+
+    async def drain_metrics():
+        while True:
+            metrics.log_metrics(await pending_metrics.get())
+            # Log everything that queued up meanwhile in the same wakeup
+            flush_metrics()
+
+    metrics_task = asyncio.create_task(drain_metrics())
 
     async def log_usage():
+        metrics_task.cancel()
+        flush_metrics()
         summary = usage_collector.get_summary()
         logger.info(f"Usage: {summary}")
 
@@ -361,7 +326,12 @@ async def entrypoint(ctx: JobContext):
 
     # Start the session, which initializes the voice pipeline and warms up the models
     await session.start(
-        agent=Assistant(),
+        agent=Assistant(
+            memory_tools=ctx.proc.userdata["memory_tools"],
+            twilio_tool=ctx.proc.userdata["twilio_tool"],
+            emergency_tool=ctx.proc.userdata["emergency_tool"],
+            mailjet_tool=ctx.proc.userdata["mailjet_tool"],
+        ),
         room=ctx.room,
         room_input_options=RoomInputOptions(
             # For telephony applications, use `BVCTelephony` for best results
@@ -2,17 +2,16 @@
 Consent and Escalation Tool for LiveKit Agents
 """
 
-import os
 import logging
-from typing import Dict, Optional, List
 from dataclasses import dataclass
+from typing import ClassVar
 from livekit.agents import function_tool, RunContext
 from datetime import datetime
 
 logger = logging.getLogger("consent_escalation")
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsentRecord:
     """Record of consent given by user"""
 
@@ -23,7 +22,7 @@ class ConsentRecord:
     details: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class EscalationRecord:
     """Record of escalation events"""
 
@@ -32,15 +31,50 @@ class EscalationRecord:
     timestamp: datetime
     user_id: str
     status: str = "pending"  # pending, resolved, cancelled
-    assigned_to: Optional[str] = None
+    assigned_to: str | None = None
 
 
 class ConsentEscalationTool:
     """Tool for handling consent and escalation in healthcare/elderly care scenarios"""
 
+    # Fixed prompts for the common consent types
+    CONSENT_PROMPTS: ClassVar[dict[str, str]] = {
+        "recording": "I'd like to record our conversation for quality assurance and to help me remember our chats. Is that okay with you?",
+        "medical": "To help you better, I'd like to ask about your health and share information with your care team. Is that okay?",
+        "data_sharing": "I'd like to share information about our conversations with your family members to keep them updated. Is that okay?",
+    }
+
+    # Severity -> (log level, log label, response template)
+    ESCALATION_RESPONSES: ClassVar[dict[str, tuple[int, str, str]]] = {
+        "critical": (
+            logging.CRITICAL,
+            "CRITICAL escalation",
+            "I'm immediately escalating this critical {concern_type} concern. Emergency services will be contacted right away.",
+        ),
+        "high": (
+            logging.WARNING,
+            "HIGH priority escalation",
+            "I'm escalating this {concern_type} concern to your doctor and family immediately.",
+        ),
+        "medium": (
+            logging.INFO,
+            "MEDIUM priority escalation",
+            "I'm escalating this {concern_type} concern to your care team. They'll follow up soon.",
+        ),
+        "low": (
+            logging.INFO,
+            "LOW priority escalation",
+            "I've noted this {concern_type} concern and will share it with your family during their next check-in.",
+        ),
+    }
+
     def __init__(self):
-        self.consent_records: List[ConsentRecord] = []
-        self.escalation_records: List[EscalationRecord] = []
+        self.consent_records: list[ConsentRecord] = []
+        self.escalation_records: list[EscalationRecord] = []
+        # Lookup indexes over the records above: user_id -> consent_type -> newest
+        # record, and user_id -> that user's escalations
+        self._latest_consents: dict[str, dict[str, ConsentRecord]] = {}
+        self._user_escalations: dict[str, list[EscalationRecord]] = {}
 
         # Emergency contacts
         self.emergency_contacts = {
@@ -58,6 +92,11 @@ class ConsentEscalationTool:
             "critical": "immediate emergency response",
         }
 
+    def _get_user_id(self, context: RunContext) -> str:
+        """Get user ID from context (room name)"""
+        room = getattr(context, "room", None)
+        return room.name if room else "unknown"
+
     @function_tool
     async def request_consent(
         self, context: RunContext, consent_type: str, purpose: str = ""
@@ -71,7 +110,7 @@ class ConsentEscalationTool:
         if not consent_type or consent_type.strip() == "":
             return "What type of consent do you need?"
 
-        user_id = getattr(context, "room", {}).get("name", "unknown")
+        user_id = self._get_user_id(context)
 
         # Check if consent already given
         existing_consent = self._get_latest_consent(user_id, consent_type)
@@ -81,14 +120,10 @@ class ConsentEscalationTool:
             )
 
         # Request consent
-        if consent_type == "recording":
-            return f"I'd like to record our conversation for quality assurance and to help me remember our chats. Is that okay with you?"
-        elif consent_type == "medical":
-            return f"To help you better, I'd like to ask about your health and share information with your care team. Is that okay?"
-        elif consent_type == "data_sharing":
-            return f"I'd like to share information about our conversations with your family members to keep them updated. Is that okay?"
-        else:
-            return f"I need your permission to {consent_type}. {purpose} Is that okay?"
+        prompt = self.CONSENT_PROMPTS.get(consent_type)
+        if prompt:
+            return prompt
+        return f"I need your permission to {consent_type}. {purpose} Is that okay?"
 
     @function_tool
     async def record_consent(
@@ -104,7 +139,7 @@ class ConsentEscalationTool:
         if not consent_type or consent_type.strip() == "":
             return "What type of consent are you recording?"
 
-        user_id = getattr(context, "room", {}).get("name", "unknown")
+        user_id = self._get_user_id(context)
 
         # Create consent record
         consent_record = ConsentRecord(
@@ -115,13 +150,13 @@ class ConsentEscalationTool:
             details=details,
         )
 
-        self.consent_records.append(consent_record)
+        self._add_consent(consent_record)
 
         if given:
-            logger.info(f"Consent given for {consent_type} by {user_id}")
+            logger.info("Consent given for %s by %s", consent_type, user_id)
             return f"Thank you! I've recorded your consent for {consent_type}."
         else:
-            logger.info(f"Consent denied for {consent_type} by {user_id}")
+            logger.info("Consent denied for %s by %s", consent_type, user_id)
             return f"I understand. I've noted that you don't want to give consent for {consent_type}."
 
     @function_tool
@@ -134,7 +169,7 @@ class ConsentEscalationTool:
         if not consent_type or consent_type.strip() == "":
             return "What type of consent should I check?"
 
-        user_id = getattr(context, "room", {}).get("name", "unknown")
+        user_id = self._get_user_id(context)
         consent = self._get_latest_consent(user_id, consent_type)
 
         if not consent:
@@ -162,7 +197,7 @@ class ConsentEscalationTool:
         if not concern_type or not severity:
             return "What type of concern needs to be escalated and how severe is it?"
 
-        user_id = getattr(context, "room", {}).get("name", "unknown")
+        user_id = self._get_user_id(context)
 
         # Create escalation record
         escalation = EscalationRecord(
@@ -173,21 +208,14 @@ class ConsentEscalationTool:
             status="pending",
         )
 
-        self.escalation_records.append(escalation)
+        self._add_escalation(escalation)
 
-        # Determine appropriate response based on severity
-        if severity == "critical":
-            logger.critical(f"CRITICAL escalation: {concern_type} - {description}")
-            return f"I'm immediately escalating this critical {concern_type} concern. Emergency services will be contacted right away."
-        elif severity == "high":
-            logger.warning(f"HIGH priority escalation: {concern_type} - {description}")
-            return f"I'm escalating this {concern_type} concern to your doctor and family immediately."
-        elif severity == "medium":
-            logger.info(f"MEDIUM priority escalation: {concern_type} - {description}")
-            return f"I'm escalating this {concern_type} concern to your care team. They'll follow up soon."
-        else:  # low
-            logger.info(f"LOW priority escalation: {concern_type} - {description}")
-            return f"I've noted this {concern_type} concern and will share it with your family during their next check-in."
+        # Determine appropriate response based on severity (unknown -> low)
+        level, label, response = self.ESCALATION_RESPONSES.get(
+            severity, self.ESCALATION_RESPONSES["low"]
+        )
+        logger.log(level, "%s: %s - %s", label, concern_type, description)
+        return response.format(concern_type=concern_type)
 
     @function_tool
     async def emergency_contact(
@@ -202,7 +230,7 @@ class ConsentEscalationTool:
         if not contact_type or contact_type.strip() == "":
             return "Who should I contact for you?"
 
-        user_id = getattr(context, "room", {}).get("name", "unknown")
+        user_id = self._get_user_id(context)
 
         if contact_type.lower() in self.emergency_contacts:
             contact_number = self.emergency_contacts[contact_type.lower()]
@@ -216,9 +244,11 @@ class ConsentEscalationTool:
                 status="in_progress",
                 assigned_to=contact_type,
             )
-            self.escalation_records.append(escalation)
+            self._add_escalation(escalation)
 
-            logger.warning(f"Emergency contact initiated: {contact_type} for {user_id}")
+            logger.warning(
+                "Emergency contact initiated: %s for %s", contact_type, user_id
+            )
             return f"I'm contacting {contact_type} right now at {contact_number}. They'll be here soon."
         else:
             return f"I don't have contact information for {contact_type}. Let me try your family or doctor instead."
@@ -226,12 +256,10 @@ class ConsentEscalationTool:
     @function_tool
     async def check_escalations(self, context: RunContext):
         """Check status of pending escalations."""
-        user_id = getattr(context, "room", {}).get("name", "unknown")
+        user_id = self._get_user_id(context)
 
         pending_escalations = [
-            e
-            for e in self.escalation_records
-            if e.user_id == user_id and e.status == "pending"
+            e for e in self._user_escalations.get(user_id, []) if e.status == "pending"
         ]
 
         if not pending_escalations:
@@ -243,35 +271,28 @@ class ConsentEscalationTool:
 
         return f"You have {len(pending_escalations)} pending escalations: {'; '.join(escalation_list)}"
 
+    def _add_consent(self, record: ConsentRecord):
+        """Store a consent record and update the latest-consent index"""
+        self.consent_records.append(record)
+        user_consents = self._latest_consents.setdefault(record.user_id, {})
+        latest = user_consents.get(record.consent_type)
+        if latest is None or record.timestamp >= latest.timestamp:
+            user_consents[record.consent_type] = record
+
+    def _add_escalation(self, escalation: EscalationRecord):
+        """Store an escalation record and index it by user"""
+        self.escalation_records.append(escalation)
+        self._user_escalations.setdefault(escalation.user_id, []).append(escalation)
+
     def _get_latest_consent(
         self, user_id: str, consent_type: str
-    ) -> Optional[ConsentRecord]:
+    ) -> ConsentRecord | None:
         """Get the latest consent record for a user and consent type"""
-        user_consents = [
-            c
-            for c in self.consent_records
-            if c.user_id == user_id and c.consent_type == consent_type
-        ]
+        return self._latest_consents.get(user_id, {}).get(consent_type)
 
-        if not user_consents:
-            return None
-
-        # Return the most recent consent
-        return max(user_consents, key=lambda x: x.timestamp)
-
-    def get_consent_summary(self, user_id: str) -> Dict[str, bool]:
+    def get_consent_summary(self, user_id: str) -> dict[str, bool]:
         """Get summary of all consents for a user"""
-        user_consents = [c for c in self.consent_records if c.user_id == user_id]
-
-        summary = {}
-        for consent in user_consents:
-            # Only keep the latest consent for each type
-            if consent.consent_type not in summary:
-                summary[consent.consent_type] = consent.given
-            else:
-                # If we already have this consent type, check if this one is more recent
-                existing = self._get_latest_consent(user_id, consent.consent_type)
-                if existing and consent.timestamp > existing.timestamp:
-                    summary[consent.consent_type] = consent.given
-
-        return summary
+        return {
+            consent_type: consent.given
+            for consent_type, consent in self._latest_consents.get(user_id, {}).items()
+        }
@@ -1,17 +1,90 @@
 import asyncio
+import functools
 import logging
 import os
-from typing import Dict, List
+import re
+import time
+from xml.sax.saxutils import escape
 from livekit.agents import function_tool, RunContext
-from twilio.rest import Client
-from twilio.twiml.voice_response import VoiceResponse
+
+from .twilio_client import get_twilio_client
 
 logger = logging.getLogger("emergency_tool")
 
+_STATUS_EVENTS = ("initiated", "answered", "completed")
+
+_TWIML_TEMPLATES = {
+    "emergency": (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<Response>"
+        "<Say>EMERGENCY CALL: {message}</Say>"
+        '<Pause length="2"/>'
+        "<Say>This is an emergency call for Maggie. {message}</Say>"
+        "<Say>Please stay on the line. This is an automated emergency call.</Say>"
+        "</Response>"
+    ),
+    "911": (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<Response>"
+        "<Say>911 Emergency: {message}</Say>"
+        "<Say>This is an automated emergency call for Maggie Thompson.</Say>"
+        '<Pause length="3"/>'
+        "<Say>Emergency details: {message}</Say>"
+        "</Response>"
+    ),
+}
+
+_NO_CONTACT_REPLY = (
+    "I tried to call for help but couldn't reach anyone. "
+    "Please call 911 directly or ask someone nearby for help immediately."
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _build_twiml(kind: str, message: str) -> str:
+    """Generate TwiML for an emergency ("emergency") or 911 ("911") call"""
+    return _TWIML_TEMPLATES[kind].format(message=escape(message))
+
 
 class EmergencyTool:
     """Tool for handling emergency situations and calling for help"""
-    
+
+    __slots__ = (
+        "_contacts_listing",
+        "_cooldown_until",
+        "_phrase_pattern",
+        "_phrase_set",
+        "account_sid",
+        "auth_token",
+        "client",
+        "emergency_911_status_url",
+        "emergency_contacts",
+        "emergency_cooldown",
+        "emergency_phrases",
+        "emergency_status_url",
+        "from_number",
+    )
+
+    # Default phrases shared by every instance; add_emergency_phrase extends a copy
+    EMERGENCY_PHRASES = (
+        "help",
+        "help me",
+        "emergency",
+        "urgent",
+        "call for help",
+        "i need help",
+        "something's wrong",
+        "i'm hurt",
+        "i fell",
+        "i can't get up",
+        "i'm scared",
+        "call someone",
+        "call 911",
+    )
+
+    _VALID_PRIORITIES = frozenset({"primary", "secondary", "doctor"})
+    _VALID_PRIORITIES_STR = "primary, secondary, doctor"
+
     def __init__(self):
         self.account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         self.auth_token = os.getenv("TWILIO_AUTH_TOKEN")
@@ -21,9 +94,17 @@ class EmergencyTool:
             logger.warning("Twilio credentials not found. Emergency calls will not be available.")
             self.client = None
         else:
-            self.client = Client(self.account_sid, self.auth_token)
+            self.client = get_twilio_client(self.account_sid, self.auth_token)
             logger.info("Emergency tool initialized with Twilio")
         
+        # Webhooks that receive Twilio call status updates
+        self.emergency_status_url = os.getenv(
+            "EMERGENCY_STATUS_URL", "https://your-webhook-url.com/emergency-status"
+        )
+        self.emergency_911_status_url = os.getenv(
+            "EMERGENCY_911_STATUS_URL", "https://your-webhook-url.com/911-status"
+        )
+
         # Emergency contacts in order of priority
         self.emergency_contacts = {
             "primary": "14085135506",      # Wesley (Maggie's son)
@@ -31,25 +112,33 @@ class EmergencyTool:
             "doctor": "+1234567895",       # Family doctor
             "emergency": "911",            # Emergency services
         }
+        self._contacts_listing = None  # rendered by list_emergency_contacts
         
         # Emergency phrases that trigger the tool
-        self.emergency_phrases = [
-            "help", "help me", "emergency", "urgent", "call for help",
-            "i need help", "something's wrong", "i'm hurt", "i fell",
-            "i can't get up", "i'm scared", "call someone", "call 911"
-        ]
+        self.emergency_phrases = list(self.EMERGENCY_PHRASES)
+        self._phrase_set = set(self.emergency_phrases)
+        self._rebuild_phrase_pattern()
         
         # Track emergency calls to avoid spam
-        self.last_emergency_call = 0
         self.emergency_cooldown = 300  # 5 minutes between emergency calls
+        self._cooldown_until = 0.0  # time.monotonic() deadline of the cooldown
     
     def is_emergency_phrase(self, text: str) -> bool:
         """Check if the text contains emergency phrases"""
         if not text:
             return False
         
-        text_lower = text.lower().strip()
-        return any(phrase in text_lower for phrase in self.emergency_phrases)
+        return self._phrase_pattern.search(text) is not None
+
+    def _rebuild_phrase_pattern(self):
+        """Compile the emergency phrases into a single regex alternation"""
+        # One C-level scan per utterance instead of a Python loop per phrase;
+        # IGNORECASE folds case during the match so the text is never copied.
+        # Lookarounds rather than \b, so phrases like "sos!" still match
+        alternation = "|".join(re.escape(phrase) for phrase in self.emergency_phrases)
+        self._phrase_pattern = re.compile(
+            rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE
+        )
     
     @function_tool
     async def emergency_call(self, context: RunContext, emergency_type: str = "general", message: str = ""):
@@ -63,44 +152,76 @@ class EmergencyTool:
             return "I'm sorry, I can't make emergency calls right now. Please call 911 directly or ask someone nearby for help."
         
         # Check cooldown to prevent spam
-        import time
-        current_time = time.time()
-        if current_time - self.last_emergency_call < self.emergency_cooldown:
+        now = time.monotonic()
+        if now < self._cooldown_until:
             return "I just called for help. Someone should be on their way. If this is a new emergency, please call 911 directly."
         
+        # Claim the cooldown before the first await so a concurrent trigger
+        # can't pass the check above while these calls are still dialing
+        self._cooldown_until = now + self.emergency_cooldown
+
         try:
-            # Determine which number to call based on emergency type
-            if emergency_type.lower() in ["medical", "fall", "urgent"]:
-                phone_number = self.emergency_contacts["primary"]  # Call Wesley first
-                contact_name = "Wesley (your son)"
-            else:
-                phone_number = self.emergency_contacts["primary"]  # Default to Wesley
-                contact_name = "Wesley (your son)"
-            
             # Create emergency message
-            emergency_message = f"EMERGENCY: Maggie needs help immediately. {message}".strip()
-            if not emergency_message.endswith("."):
-                emergency_message += "."
-            
-            # Make the call
-            call = self.client.calls.create(
-                to=phone_number,
-                from_=self.from_number,
-                twiml=self._generate_emergency_twiml(emergency_message),
-                status_callback=f"https://your-webhook-url.com/emergency-status",
-                status_callback_event=['initiated', 'answered', 'completed']
+            details = message.strip()
+            if details and not details.endswith((".", "!", "?")):
+                details += "."
+            emergency_message = (
+                f"EMERGENCY: Maggie needs help immediately. {details}".rstrip()
             )
             
-            # Update last call time
-            self.last_emergency_call = current_time
+            # Call every family contact at once so nobody waits on an unanswered line
+            targets = [
+                (priority, self.emergency_contacts[priority])
+                for priority in ("primary", "secondary", "doctor")
+                if priority in self.emergency_contacts
+            ]
+            twiml = _build_twiml("emergency", emergency_message)
+            results = await asyncio.gather(
+                *(
+                    self._create_call(
+                        to=phone_number,
+                        twiml=twiml,
+                        status_callback=self.emergency_status_url,
+                    )
+                    for _, phone_number in targets
+                ),
+                return_exceptions=True,
+            )
             
-            logger.critical(f"EMERGENCY CALL MADE: {contact_name} at {phone_number} - {emergency_message}")
+            reached = []
+            for (priority, phone_number), result in zip(targets, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        "Emergency call to %s at %s failed: %s",
+                        priority,
+                        phone_number,
+                        result,
+                    )
+                else:
+                    reached.append(priority)
+                    logger.critical(
+                        "EMERGENCY CALL MADE: %s at %s - %s",
+                        priority,
+                        phone_number,
+                        emergency_message,
+                    )
             
+            if not reached:
+                logger.warning("No emergency contact could be reached")
+                # Nobody was reached, so let the next request try again right away
+                self._cooldown_until = 0.0
+                return _NO_CONTACT_REPLY
+
+            contact_name = (
+                "Wesley (your son)" if "primary" in reached else "your family"
+            )
             return f"🚨 EMERGENCY: I'm calling {contact_name} right now! Help is on the way. Stay calm, someone will be there soon."
             
         except Exception as e:
-            logger.error(f"Error making emergency call: {e}")
-            return f"I tried to call for help but couldn't reach anyone. Please call 911 directly or ask someone nearby for help immediately."
+            logger.error("Error making emergency call: %s", e)
+            # Nobody was reached, so let the next request try again right away
+            self._cooldown_until = 0.0
+            return _NO_CONTACT_REPLY
     
     @function_tool
     async def call_911(self, context: RunContext, emergency_description: str = ""):
@@ -116,20 +237,18 @@ class EmergencyTool:
             # Call 911
             emergency_message = f"Emergency call for Maggie. {emergency_description}".strip()
             
-            call = self.client.calls.create(
+            call = await self._create_call(
                 to="911",
-                from_=self.from_number,
-                twiml=self._generate_911_twiml(emergency_message),
-                status_callback=f"https://your-webhook-url.com/911-status",
-                status_callback_event=['initiated', 'answered', 'completed']
+                twiml=_build_twiml("911", emergency_message),
+                status_callback=self.emergency_911_status_url,
             )
             
-            logger.critical(f"911 CALL MADE: {emergency_message}")
+            logger.critical("911 CALL MADE: %s", emergency_message)
             
             return "🚨 I'm calling 911 right now! Emergency services are being contacted. Stay calm and help will arrive soon."
             
         except Exception as e:
-            logger.error(f"Error calling 911: {e}")
+            logger.error("Error calling 911: %s", e)
             return "I couldn't call 911. Please call 911 directly on your phone immediately!"
     
     @function_tool
@@ -145,14 +264,17 @@ class EmergencyTool:
             return "I need both a name and phone number to add an emergency contact."
         
         # Validate priority
-        valid_priorities = ["primary", "secondary", "doctor"]
-        if priority.lower() not in valid_priorities:
-            return f"Priority must be one of: {', '.join(valid_priorities)}"
+        priority_key = priority.lower()
+        if priority_key not in self._VALID_PRIORITIES:
+            return f"Priority must be one of: {self._VALID_PRIORITIES_STR}"
         
         # Add the contact
-        self.emergency_contacts[priority.lower()] = phone_number
+        self.emergency_contacts[priority_key] = phone_number
+        self._contacts_listing = None
         
-        logger.info(f"Added emergency contact: {name} ({priority}) - {phone_number}")
+        logger.info(
+            "Added emergency contact: %s (%s) - %s", name, priority, phone_number
+        )
         
         return f"✅ Added {name} as a {priority} emergency contact. They'll be called if you need help."
     
@@ -162,61 +284,40 @@ class EmergencyTool:
         if not self.emergency_contacts:
             return "No emergency contacts set up yet."
         
-        contact_list = []
-        for priority, number in self.emergency_contacts.items():
-            masked_number = f"{number[:3]}***{number[-4:]}" if len(number) > 7 else "***"
-            contact_list.append(f"• {priority.title()}: {masked_number}")
-        
-        return f"Emergency contacts:\n" + "\n".join(contact_list)
-    
-    def _generate_emergency_twiml(self, message: str) -> str:
-        """Generate TwiML for emergency calls"""
-        response = VoiceResponse()
-        
-        # Say the emergency message
-        response.say(f"EMERGENCY CALL: {message}")
-        
-        # Add a pause
-        response.pause(length=2)
-        
-        # Repeat the message
-        response.say(f"This is an emergency call for Maggie. {message}")
-        
-        # Add hold music or instructions
-        response.say("Please stay on the line. This is an automated emergency call.")
-        
-        return str(response)
+        # Contacts only change in add_emergency_contact, which clears this
+        if self._contacts_listing is None:
+            self._contacts_listing = "Emergency contacts:\n" + "\n".join(
+                f"• {priority.title()}: "
+                + (f"{number[:3]}***{number[-4:]}" if len(number) > 7 else "***")
+                for priority, number in self.emergency_contacts.items()
+            )
+        return self._contacts_listing
     
-    def _generate_911_twiml(self, message: str) -> str:
-        """Generate TwiML for 911 calls"""
-        response = VoiceResponse()
-        
-        # Say the emergency message to 911
-        response.say(f"911 Emergency: {message}")
-        
-        # Add location if available
-        response.say("This is an automated emergency call for Maggie Thompson.")
-        
-        # Add pause for 911 operator
-        response.pause(length=3)
-        
-        # Repeat critical information
-        response.say(f"Emergency details: {message}")
-        
-        return str(response)
+    async def _create_call(self, to: str, twiml: str, status_callback: str):
+        """Place a Twilio call without blocking the event loop"""
+        # The Twilio client is synchronous, so run the request in a worker thread
+        return await asyncio.to_thread(
+            self.client.calls.create,
+            to=to,
+            from_=self.from_number,
+            twiml=twiml,
+            status_callback=status_callback,
+            status_callback_event=_STATUS_EVENTS,
+        )
     
-    def get_emergency_phrases(self) -> List[str]:
-        """Get list of emergency phrases that trigger the tool"""
-        return self.emergency_phrases.copy()
+    def get_emergency_phrases(self) -> tuple[str, ...]:
+        """Get the emergency phrases that trigger the tool"""
+        return tuple(self.emergency_phrases)
     
     def add_emergency_phrase(self, phrase: str):
         """Add a new emergency phrase"""
-        if phrase and phrase.lower() not in self.emergency_phrases:
-            self.emergency_phrases.append(phrase.lower())
-            logger.info(f"Added emergency phrase: {phrase}")
+        phrase_lower = phrase.lower() if phrase else ""
+        if phrase_lower and phrase_lower not in self._phrase_set:
+            self._phrase_set.add(phrase_lower)
+            self.emergency_phrases.append(phrase_lower)
+            self._rebuild_phrase_pattern()
+            logger.info("Added emergency phrase: %s", phrase)
     
     def is_in_cooldown(self) -> bool:
         """Check if emergency calls are in cooldown period"""
-        import time
-        current_time = time.time()
-        return (current_time - self.last_emergency_call) < self.emergency_cooldown
+        return time.monotonic() < self._cooldown_until
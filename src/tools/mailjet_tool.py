@@ -1,11 +1,78 @@
+import asyncio
+import html
 import logging
 import os
+from string import Template
 from typing import Dict, List, Optional
 from mailjet_rest import Client
 from livekit.agents import function_tool, RunContext
 
 logger = logging.getLogger(__name__)
 
+# Emergency notification bodies, parsed once and filled per alert
+_EMERGENCY_TEXT = Template(
+    """
+EMERGENCY ALERT - MAGGIE THOMPSON
+================================
+
+TIMESTAMP: $timestamp
+EMERGENCY TYPE: $emergency_type
+STATUS: ACTIVE
+
+DETAILS:
+$details
+
+This is an automated emergency notification from Heather, Maggie's AI assistant.
+Please check on Maggie immediately.
+
+---
+Heather AI Assistant
+Emergency Notification System
+""".strip()
+)
+
+_EMERGENCY_HTML = Template(
+    """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Emergency Alert</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .header { background-color: #ff4444; color: white; padding: 15px; border-radius: 5px; }
+        .content { margin: 20px 0; }
+        .details { background-color: #f5f5f5; padding: 15px; border-left: 4px solid #ff4444; }
+        .footer { margin-top: 30px; font-size: 12px; color: #666; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🚨 EMERGENCY ALERT - MAGGIE THOMPSON</h1>
+    </div>
+    
+    <div class="content">
+        <p><strong>TIMESTAMP:</strong> $timestamp</p>
+        <p><strong>EMERGENCY TYPE:</strong> $emergency_type</p>
+        <p><strong>STATUS:</strong> <span style="color: #ff4444;">ACTIVE</span></p>
+        
+        <div class="details">
+            <h3>DETAILS:</h3>
+            <p>$details</p>
+        </div>
+        
+        <p><strong>Action Required:</strong> Please check on Maggie immediately.</p>
+    </div>
+    
+    <div class="footer">
+        <p>This is an automated emergency notification from Heather, Maggie's AI assistant.</p>
+        <p>Heather AI Assistant | Emergency Notification System</p>
+    </div>
+</body>
+</html>
+""".strip()
+)
+
 
 class MailjetTool:
     """Tool for sending emails via Mailjet API"""
@@ -55,15 +122,10 @@ class MailjetTool:
             }
 
         try:
-            # Prepare recipients
-            recipients = []
-            for email in to_emails:
-                recipients.append(
-                    {
-                        "Email": email,
-                        "Name": email.split("@")[0],  # Use email prefix as name
-                    }
-                )
+            # Prepare recipients, using the email prefix as the name
+            recipients = [
+                {"Email": email, "Name": email.partition("@")[0]} for email in to_emails
+            ]
 
             # Prepare email data
             email_data = {
@@ -83,11 +145,11 @@ class MailjetTool:
             if reply_to:
                 email_data["Messages"][0]["ReplyTo"] = {
                     "Email": reply_to,
-                    "Name": reply_to.split("@")[0],
+                    "Name": reply_to.partition("@")[0],
                 }
 
-            # Send email
-            result = self.client.send.create(data=email_data)
+            # Send email; mailjet_rest is synchronous, so keep it off the event loop
+            result = await asyncio.to_thread(self.client.send.create, data=email_data)
 
             if result.status_code == 200:
                 response_data = result.json()
@@ -135,72 +197,24 @@ class MailjetTool:
         Returns:
             Dict with success status and message
         """
-        subject = f"EMERGENCY ALERT - Maggie Thompson - {emergency_type.upper()}"
+        emergency_type = emergency_type.upper()
+        subject = f"EMERGENCY ALERT - Maggie Thompson - {emergency_type}"
 
         # Plain text content
-        text_content = f"""
-EMERGENCY ALERT - MAGGIE THOMPSON
-================================
-
-TIMESTAMP: {timestamp}
-EMERGENCY TYPE: {emergency_type.upper()}
-STATUS: ACTIVE
-
-DETAILS:
-{details}
-
-This is an automated emergency notification from Heather, Maggie's AI assistant.
-Please check on Maggie immediately.
-
----
-Heather AI Assistant
-Emergency Notification System
-        """.strip()
+        text_content = _EMERGENCY_TEXT.substitute(
+            timestamp=timestamp, emergency_type=emergency_type, details=details
+        )
 
-        # HTML content for better formatting
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Emergency Alert</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        .header {{ background-color: #ff4444; color: white; padding: 15px; border-radius: 5px; }}
-        .content {{ margin: 20px 0; }}
-        .details {{ background-color: #f5f5f5; padding: 15px; border-left: 4px solid #ff4444; }}
-        .footer {{ margin-top: 30px; font-size: 12px; color: #666; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🚨 EMERGENCY ALERT - MAGGIE THOMPSON</h1>
-    </div>
-    
-    <div class="content">
-        <p><strong>TIMESTAMP:</strong> {timestamp}</p>
-        <p><strong>EMERGENCY TYPE:</strong> {emergency_type.upper()}</p>
-        <p><strong>STATUS:</strong> <span style="color: #ff4444;">ACTIVE</span></p>
-        
-        <div class="details">
-            <h3>DETAILS:</h3>
-            <p>{details}</p>
-        </div>
-        
-        <p><strong>Action Required:</strong> Please check on Maggie immediately.</p>
-    </div>
-    
-    <div class="footer">
-        <p>This is an automated emergency notification from Heather, Maggie's AI assistant.</p>
-        <p>Heather AI Assistant | Emergency Notification System</p>
-    </div>
-</body>
-</html>
-        """.strip()
+        # HTML content for better formatting; escape the caller-supplied text
+        html_content = _EMERGENCY_HTML.substitute(
+            timestamp=html.escape(timestamp),
+            emergency_type=html.escape(emergency_type),
+            details=html.escape(details),
+        )
 
         return await self.send_email(
             ctx=ctx,
-            to_emails=recipient_emails,
+            to_emails=list(dict.fromkeys(recipient_emails)),  # drop duplicates
             subject=subject,
             text_content=text_content,
             html_content=html_content,
@@ -251,7 +265,7 @@ Daily Summary Report
 
         return await self.send_email(
             ctx=ctx,
-            to_emails=recipient_emails,
+            to_emails=list(dict.fromkeys(recipient_emails)),  # drop duplicates
             subject=subject,
             text_content=text_content,
         )
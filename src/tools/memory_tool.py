@@ -1,20 +1,66 @@
 from livekit.agents import function_tool, RunContext
+import asyncio
+import contextlib
+import copy
 import json
 import os
+import stat
+import tempfile
 import logging
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
+from collections import OrderedDict
 from datetime import datetime
 import uuid
 
 logger = logging.getLogger("memory_tools")
 
+# Number of search responses remembered across all users
+SEARCH_CACHE_SIZE = 1024
+
+
+def _write_file_atomic(path: str, data: str):
+    """Write data to path through a temp file so readers never see a partial file"""
+    # mkstemp creates the file as 0600; keep the existing file's mode instead
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+
+    # A unique temp file per write, so concurrent writers never share one
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=os.path.basename(path), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            # Data is on disk before the rename makes it visible
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
 
 class MemoryTools:
     def __init__(self, storage_dir="user_memories"):
         self.storage_dir = storage_dir
         self.client = None
         self.collections = {}
+        # One embedding model shared by every user's collection
+        self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        # (user_id, normalized query) -> (memory count, response), least recently
+        # used first; an entry is only reused while the count is unchanged
+        self._search_cache = OrderedDict()
+        # user_id -> (st_mtime_ns, metadata dict) of the last metadata file read;
+        # reread whenever the file changes, since other processes may write it
+        self._metadata_cache = {}
+        # user_id -> lock held for a whole load, update and save of the metadata
+        self._metadata_locks = {}
 
         # Create storage directory
         if not os.path.exists(storage_dir):
@@ -51,7 +97,9 @@ class MemoryTools:
 
             # Get or create collection with built-in embeddings
             collection = self.client.get_or_create_collection(
-                name=collection_name, metadata={"user_id": user_id}
+                name=collection_name,
+                metadata={"user_id": user_id},
+                embedding_function=self._embedding_function,
             )
 
             self.collections[user_id] = collection
@@ -61,6 +109,12 @@ class MemoryTools:
             logger.error(f"Error getting collection: {e}")
             raise
 
+    async def _get_count(self, collection) -> int:
+        """Get the number of memories in a user's collection, off the event loop"""
+        # Not cached: other workers and scripts write the same persistent store,
+        # and count() is a cheap COUNT(*)
+        return await asyncio.to_thread(collection.count)
+
     def _get_metadata_file(self, user_id: str) -> str:
         """Get path to user's metadata file (for personal info)"""
         return os.path.join(self.storage_dir, f"{user_id}_metadata.json")
@@ -68,27 +122,51 @@ class MemoryTools:
     def _load_metadata(self, user_id: str) -> dict:
         """Load user's metadata (personal info)"""
         file_path = self._get_metadata_file(user_id)
-        if os.path.exists(file_path):
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            self._metadata_cache.pop(user_id, None)
+            return {"personal_info": {}, "created_at": datetime.now().isoformat()}
+
+        cached = self._metadata_cache.get(user_id)
+        if cached is None or cached[0] != mtime_ns:
             try:
                 with open(file_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                    metadata = json.load(f)
             except Exception as e:
                 logger.error(f"Error loading metadata: {e}")
+                return {"personal_info": {}, "created_at": datetime.now().isoformat()}
+            cached = (mtime_ns, metadata)
+            self._metadata_cache[user_id] = cached
 
-        return {"personal_info": {}, "created_at": datetime.now().isoformat()}
+        # Callers modify the dict they get, so never hand out the cached one
+        return copy.deepcopy(cached[1])
 
-    def _save_metadata(self, user_id: str, metadata: dict):
+    async def _save_metadata(self, user_id: str, metadata: dict):
         """Save user's metadata"""
-        metadata["updated_at"] = datetime.now().isoformat()
         file_path = self._get_metadata_file(user_id)
+        metadata["updated_at"] = datetime.now().isoformat()
+        data = json.dumps(metadata, indent=2, ensure_ascii=False)
 
+        # The file is about to change, so the next load rereads it
+        self._metadata_cache.pop(user_id, None)
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(_write_file_atomic, file_path, data)
         except Exception as e:
             logger.error(f"Error saving metadata: {e}")
             raise
 
+    async def _update_personal_info(self, user_id: str, info_type: str, value: str):
+        """Set one personal info field and save the user's metadata"""
+        lock = self._metadata_locks.setdefault(user_id, asyncio.Lock())
+
+        # Hold the lock from load to save, so a concurrent update can't save a
+        # snapshot taken before this one and drop its field
+        async with lock:
+            metadata = self._load_metadata(user_id)
+            metadata["personal_info"][info_type] = value
+            await self._save_metadata(user_id, metadata)
+
     @function_tool
     async def store_personal_info(
         self, context: RunContext, info_type: str, value: str
@@ -101,10 +179,7 @@ class MemoryTools:
         """
         try:
             user_id = self._get_user_id(context)
-            metadata = self._load_metadata(user_id)
-
-            metadata["personal_info"][info_type] = value
-            self._save_metadata(user_id, metadata)
+            await self._update_personal_info(user_id, info_type, value)
 
             logger.info(f"Stored {info_type} for user {user_id}")
             return (
@@ -139,7 +214,8 @@ class MemoryTools:
             memory_id = str(uuid.uuid4())
 
             # Store in ChromaDB with metadata
-            collection.add(
+            await asyncio.to_thread(
+                collection.add,
                 documents=[content],
                 metadatas=[
                     {
@@ -170,14 +246,23 @@ class MemoryTools:
             collection = self._get_collection(user_id)
 
             # Check if collection has any memories
-            count = collection.count()
-            if count == 0:
+            memory_count = await self._get_count(collection)
+            if memory_count == 0:
                 return "I don't have any memories stored yet. Would you like to tell me about your life?"
 
+            # Other writers share the store, so a changed count invalidates the entry
+            cache_key = (user_id, query.strip().casefold())
+            cached = self._search_cache.get(cache_key)
+            if cached is not None and cached[0] == memory_count:
+                self._search_cache.move_to_end(cache_key)
+                return cached[1]
+
             # Search using ChromaDB's built-in semantic search
-            results = collection.query(
+            results = await asyncio.to_thread(
+                collection.query,
                 query_texts=[query],
-                n_results=2,  # Get top 2 most relevant memories
+                n_results=1,  # Only the most relevant memory is used
+                include=["documents", "metadatas"],
             )
 
             if not results["documents"][0]:
@@ -187,12 +272,16 @@ class MemoryTools:
             best_content = results["documents"][0][0]
             best_metadata = results["metadatas"][0][0]
 
-            response = f"I remember you told me: {best_content}"
-
-            if best_metadata.get("year"):
-                response += f" That was in {best_metadata['year']}."
+            year = best_metadata.get("year")
+            response = f"I remember you told me: {best_content}" + (
+                f" That was in {year}." if year else ""
+            )
 
             logger.info(f"Found memory for query '{query}' for user {user_id}")
+            self._search_cache[cache_key] = (memory_count, response)
+            self._search_cache.move_to_end(cache_key)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
             return response
 
         except Exception as e:
@@ -234,7 +323,7 @@ class MemoryTools:
             collection = self._get_collection(user_id)
             metadata = self._load_metadata(user_id)
 
-            memory_count = collection.count()
+            memory_count = await self._get_count(collection)
             info = metadata.get("personal_info", {})
 
             if memory_count == 0 and not info:
@@ -242,12 +331,11 @@ class MemoryTools:
                     "We haven't stored any memories yet. I'd love to hear your story!"
                 )
 
-            response = f"I have {memory_count} memories stored about your life"
-
-            if info and "name" in info:
-                response += f", {info['name']}"
-
-            response += ". What would you like to talk about?"
+            name = f", {info['name']}" if "name" in info else ""
+            response = (
+                f"I have {memory_count} memories stored about your life{name}. "
+                "What would you like to talk about?"
+            )
 
             logger.info(f"Memory summary for user {user_id}: {memory_count} memories")
             return response
@@ -267,8 +355,13 @@ class MemoryTools:
             user_id = self._get_user_id(context)
             collection = self._get_collection(user_id)
 
-            # Get all memories and filter by category
-            results = collection.get(where={"category": category})
+            # Only the first memory in the category is returned
+            results = await asyncio.to_thread(
+                collection.get,
+                where={"category": category},
+                limit=1,
+                include=["documents", "metadatas"],
+            )
 
             if not results["documents"]:
                 return f"I don't have any memories about {category} yet. Would you like to share some?"
@@ -277,13 +370,12 @@ class MemoryTools:
             content = results["documents"][0]
             metadata = results["metadatas"][0]
 
-            response = f"About your {category}: {content}"
-            if metadata.get("year"):
-                response += f" This was in {metadata['year']}."
-
-            logger.info(
-                f"Found {len(results['documents'])} memories in category '{category}' for user {user_id}"
+            year = metadata.get("year")
+            response = f"About your {category}: {content}" + (
+                f" This was in {year}." if year else ""
             )
+
+            logger.info(f"Found memory in category '{category}' for user {user_id}")
             return response
 
         except Exception as e:
@@ -297,17 +389,17 @@ class MemoryTools:
             user_id = self._get_user_id(context)
             collection = self._get_collection(user_id)
 
-            # Get all memories
-            results = collection.get()
+            # Only the metadata is needed, not the documents
+            results = await asyncio.to_thread(collection.get, include=["metadatas"])
 
             if not results["metadatas"]:
                 return "You haven't shared any memories yet. What would you like to tell me about?"
 
-            # Extract unique categories
-            categories = set()
-            for metadata in results["metadatas"]:
-                if "category" in metadata:
-                    categories.add(metadata["category"])
+            categories = {
+                metadata["category"]
+                for metadata in results["metadatas"]
+                if metadata and "category" in metadata
+            }
 
             if categories:
                 cat_list = ", ".join(sorted(categories))
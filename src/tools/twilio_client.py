@@ -0,0 +1,17 @@
+"""
+Shared Twilio REST client for the phone tools
+"""
+
+import functools
+
+from twilio.rest import Client
+
+
+@functools.cache
+def get_twilio_client(account_sid: str, auth_token: str) -> Client:
+    """Return the process-wide Twilio client for these credentials.
+
+    Every tool instance with the same account shares one client, and with it
+    one keep-alive connection pool to api.twilio.com.
+    """
+    return Client(account_sid, auth_token)
@@ -2,15 +2,41 @@
 Twilio Phone Call Tool for LiveKit Agents
 """
 
+import asyncio
+import functools
 import os
 import logging
 from typing import Dict, Optional
-from twilio.rest import Client
 from twilio.twiml.voice_response import VoiceResponse
 from livekit.agents import function_tool, RunContext
 
+from .twilio_client import get_twilio_client
+
 logger = logging.getLogger("twilio_tool")
 
+_STATUS_EVENTS = ("initiated", "answered", "completed")
+
+
+@functools.lru_cache(maxsize=128)
+def _generate_twiml(message: str = "") -> str:
+    """Generate TwiML for the phone call"""
+    response = VoiceResponse()
+
+    if message:
+        response.say(f"Hello, this is Heather calling for Maggie. {message}")
+    else:
+        response.say(
+            "Hello, this is Heather calling for Maggie. She would like to speak with you."
+        )
+
+    # You can add more TwiML here, like:
+    # - Play hold music
+    # - Record the conversation
+    # - Transfer to another number
+    # - etc.
+
+    return str(response)
+
 
 class TwilioTool:
     """Tool for making phone calls using Twilio"""
@@ -26,9 +52,14 @@ class TwilioTool:
             )
             self.client = None
         else:
-            self.client = Client(self.account_sid, self.auth_token)
+            self.client = get_twilio_client(self.account_sid, self.auth_token)
             logger.info("Twilio client initialized successfully")
 
+        # Webhook that receives Twilio call status updates
+        self.status_callback_url = os.getenv(
+            "TWILIO_STATUS_URL", "https://your-webhook-url.com/call-status"
+        )
+
         # Contact database - you can expand this
         self.contacts = {
             "wesley": "14085135506",  # Maggie's son
@@ -38,18 +69,20 @@ class TwilioTool:
             "doctor": "+1234567895",  # Family doctor
             "nurse": "+1234567896",  # Home health nurse
         }
+        self._contacts_listing = None  # rendered by list_contacts
 
         # Family members that require consent
-        self.family_members = {"wesley", "susan", "michael", "patricia"}
+        self.family_members = frozenset({"wesley", "susan", "michael", "patricia"})
 
     def add_contact(self, name: str, phone_number: str):
         """Add a new contact to the database"""
-        self.contacts[name.lower()] = phone_number
-        logger.info(f"Added contact: {name} -> {phone_number}")
+        self.contacts[name.strip().casefold()] = phone_number
+        self._contacts_listing = None
+        logger.info("Added contact: %s -> %s", name, phone_number)
 
     def get_contact_number(self, name: str) -> Optional[str]:
         """Get phone number for a contact"""
-        return self.contacts.get(name.lower())
+        return self.contacts.get(name.strip().casefold())
 
     @function_tool
     async def make_phone_call(
@@ -67,10 +100,10 @@ class TwilioTool:
         if not contact_name or contact_name.strip() == "":
             return "Who would you like me to call?"
 
-        contact_name = contact_name.strip().lower()
+        contact_name = contact_name.strip().casefold()
 
         # Get the phone number
-        phone_number = self.get_contact_number(contact_name)
+        phone_number = self.contacts.get(contact_name)
         if not phone_number:
             return f"I don't have {contact_name}'s phone number. Would you like to give it to me?"
 
@@ -79,24 +112,9 @@ class TwilioTool:
             # Request consent before calling family
             return f"Before I call {contact_name.title()}, I want to make sure you really want to talk to them right now. Is it okay if I call {contact_name.title()}?"
 
-        try:
-            # Create the call
-            call = self.client.calls.create(
-                to=phone_number,
-                from_=self.from_number,
-                twiml=self._generate_twiml(message),
-                status_callback=f"https://your-webhook-url.com/call-status",  # Optional
-                status_callback_event=["initiated", "answered", "completed"],
-            )
-
-            logger.info(
-                f"Call initiated to {contact_name} ({phone_number}): {call.sid}"
-            )
-            return f"I'm calling {contact_name.title()} now. The call is connecting..."
-
-        except Exception as e:
-            logger.error(f"Error making call to {contact_name}: {e}")
+        if not await self._place_call(contact_name, phone_number, message):
             return f"I'm sorry, I couldn't call {contact_name}. There was a problem with the phone service."
+        return f"I'm calling {contact_name.title()} now. The call is connecting..."
 
     @function_tool
     async def add_phone_contact(
@@ -119,7 +137,7 @@ class TwilioTool:
             self.add_contact(name.strip(), phone_number.strip())
             return f"I've added {name} to your contacts with the number {phone_number}."
         except Exception as e:
-            logger.error(f"Error adding contact {name}: {e}")
+            logger.error("Error adding contact %s: %s", name, e)
             return f"I'm sorry, I couldn't add {name} to your contacts."
 
     @function_tool
@@ -128,13 +146,14 @@ class TwilioTool:
         if not self.contacts:
             return "You don't have any contacts saved yet."
 
-        contact_list = []
-        for name, number in self.contacts.items():
-            # Mask the phone number for privacy
-            masked_number = f"{number[:3]}***{number[-4:]}"
-            contact_list.append(f"{name.title()}: {masked_number}")
-
-        return f"Here are your contacts: {', '.join(contact_list)}"
+        # Contacts only change in add_contact, which clears this
+        if self._contacts_listing is None:
+            # Mask the phone numbers for privacy
+            self._contacts_listing = "Here are your contacts: " + ", ".join(
+                f"{name.title()}: {number[:3]}***{number[-4:]}"
+                for name, number in self.contacts.items()
+            )
+        return self._contacts_listing
 
     @function_tool
     async def confirm_call_consent(
@@ -154,53 +173,42 @@ class TwilioTool:
         if not self.client:
             return "I'm sorry, I can't make phone calls right now. The phone service isn't set up."
 
-        contact_name = contact_name.strip().lower()
+        contact_name = contact_name.strip().casefold()
 
         if not consent_given:
             return f"Okay, I won't call {contact_name.title()} right now. Just let me know if you change your mind."
 
         # Get the phone number
-        phone_number = self.get_contact_number(contact_name)
+        phone_number = self.contacts.get(contact_name)
         if not phone_number:
             return f"I don't have {contact_name}'s phone number. Would you like to give it to me?"
 
+        if not await self._place_call(contact_name, phone_number, message):
+            return f"I'm sorry, I couldn't call {contact_name}. There was a problem with the phone service."
+        return f"Perfect! I'm calling {contact_name.title()} now. The call is connecting..."
+
+    async def _place_call(
+        self, contact_name: str, phone_number: str, message: str
+    ) -> bool:
+        """Place a Twilio call, returning whether it was initiated"""
         try:
-            # Create the call
-            call = self.client.calls.create(
+            # The Twilio client is synchronous, so run the request in a worker thread
+            call = await asyncio.to_thread(
+                self.client.calls.create,
                 to=phone_number,
                 from_=self.from_number,
-                twiml=self._generate_twiml(message),
-                status_callback=f"https://your-webhook-url.com/call-status",  # Optional
-                status_callback_event=["initiated", "answered", "completed"],
-            )
-
-            logger.info(
-                f"Call initiated to {contact_name} ({phone_number}): {call.sid}"
+                twiml=_generate_twiml(message),
+                status_callback=self.status_callback_url,
+                status_callback_event=_STATUS_EVENTS,
             )
-            return f"Perfect! I'm calling {contact_name.title()} now. The call is connecting..."
-
         except Exception as e:
-            logger.error(f"Error making call to {contact_name}: {e}")
-            return f"I'm sorry, I couldn't call {contact_name}. There was a problem with the phone service."
-
-    def _generate_twiml(self, message: str = "") -> str:
-        """Generate TwiML for the phone call"""
-        response = VoiceResponse()
-
-        if message:
-            response.say(f"Hello, this is Heather calling for Maggie. {message}")
-        else:
-            response.say(
-                "Hello, this is Heather calling for Maggie. She would like to speak with you."
-            )
-
-        # You can add more TwiML here, like:
-        # - Play hold music
-        # - Record the conversation
-        # - Transfer to another number
-        # - etc.
+            logger.error("Error making call to %s: %s", contact_name, e)
+            return False
 
-        return str(response)
+        logger.info(
+            "Call initiated to %s (%s): %s", contact_name, phone_number, call.sid
+        )
+        return True
 
     def get_available_contacts(self) -> list:
         """Get list of available contact names"""
@@ -1,46 +1,28 @@
-#!/usr/bin/env python3
-
 import asyncio
-import sys
-import os
-
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-
-from tools.memory_tool import MemoryTools
 
 
-async def test_memory_search():
+async def test_memory_search(memory_tools, mock_context):
     """Test the memory search functionality directly"""
     print("Testing memory search...")
 
-    # Create a mock context
-    class MockContext:
-        def __init__(self):
-            self.room = type("Room", (), {"name": "test_room"})()
+    context = mock_context("test_room")
 
-    context = MockContext()
+    # Test queries, each with a phrase from the seeded memory it should find
+    test_queries = {
+        "hobbies": "gardening and knitting",
+        "high school graduation": "Lincoln High School",
+        "where did I graduate": "Lincoln High School",
+        "teaching career": "taught third grade",
+        "family children": "three children",
+    }
 
-    # Initialize memory tools
-    memory_tools = MemoryTools()
+    # Run the searches concurrently; each one waits on Chroma in a worker thread
+    results = await asyncio.gather(
+        *(memory_tools.search_memories(context, query) for query in test_queries)
+    )
 
-    # Test queries
-    test_queries = [
-        "hobbies",
-        "high school graduation",
-        "where did I graduate",
-        "teaching career",
-        "family children",
-    ]
-
-    for query in test_queries:
+    for (query, expected), result in zip(test_queries.items(), results):
         print(f"\n--- Testing query: '{query}' ---")
-        try:
-            result = await memory_tools.search_memories(context, query)
-            print(f"Result: {result}")
-        except Exception as e:
-            print(f"Error: {e}")
-
-
-if __name__ == "__main__":
-    asyncio.run(test_memory_search())
+        print(f"Result: {result}")
+        assert result.startswith("I remember you told me: ")
+        assert expected in result, query
@@ -1,33 +1,12 @@
-#!/usr/bin/env python3
-
 import asyncio
-import sys
-import os
-
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-from tools.memory_tool import MemoryTools
-from livekit.agents import RunContext
 
-class MockContext:
-    def __init__(self):
-        self.room = MockRoom()
 
-class MockRoom:
-    def __init__(self):
-        self.name = "default_user"
-
-async def test_wedding_search():
+async def test_wedding_search(memory_tools, mock_context):
     """Test searching for wedding information"""
     print("Testing wedding search functionality...")
-    
-    # Create memory tools
-    memory_tools = MemoryTools()
-    
-    # Create mock context
-    context = MockContext()
-    
+
+    context = mock_context("default_user")
+
     # Test different wedding-related queries
     queries = [
         "when did I get married",
@@ -36,24 +15,22 @@ async def test_wedding_search():
         "Robert and I married",
         "June 12, 1955",
         "wedding dress",
-        "St. Mary's Church"
+        "St. Mary's Church",
     ]
-    
-    for query in queries:
+
+    # Run the searches concurrently; each one waits on Chroma in a worker thread
+    results = await asyncio.gather(
+        *(memory_tools.search_memories(context, query) for query in queries)
+    )
+
+    for query, result in zip(queries, results):
         print(f"\nSearching for: '{query}'")
-        try:
-            result = await memory_tools.search_memories(context, query)
-            print(f"Result: {result}")
-        except Exception as e:
-            print(f"Error: {e}")
-    
-    # Test getting memory summary
-    print(f"\nGetting memory summary...")
-    try:
-        summary = await memory_tools.get_memory_summary(context)
-        print(f"Summary: {summary}")
-    except Exception as e:
-        print(f"Error: {e}")
+        print(f"Result: {result}")
+        assert result.startswith("I remember you told me: ")
+        assert "June 12, 1955" in result, query
 
-if __name__ == "__main__":
-    asyncio.run(test_wedding_search())
+    # Test getting memory summary
+    print("\nGetting memory summary...")
+    summary = await memory_tools.get_memory_summary(context)
+    print(f"Summary: {summary}")
+    assert summary.startswith("I have 2 memories stored about your life")
@@ -0,0 +1,124 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from tools.emergency_tool import EmergencyTool
+
+
+class FakeCalls:
+    """Stand-in for client.calls that records dialed numbers."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.dialed = []
+
+    def create(self, **kwargs):
+        self.dialed.append(kwargs["to"])
+        if kwargs["to"] in self.failing:
+            raise RuntimeError(f"could not reach {kwargs['to']}")
+        return SimpleNamespace(sid=f"CA{len(self.dialed)}")
+
+
+@pytest.fixture
+def emergency_tool(monkeypatch) -> EmergencyTool:
+    """An EmergencyTool built without Twilio credentials."""
+    for name in ("TWILIO_ACCOUNT_SID", "TWILIO_AUTH_TOKEN", "TWILIO_PHONE_NUMBER"):
+        monkeypatch.delenv(name, raising=False)
+    return EmergencyTool()
+
+
+def connect(tool: EmergencyTool, calls: FakeCalls) -> None:
+    tool.client = SimpleNamespace(calls=calls)
+    tool.from_number = "+15550000000"
+
+
+def test_matches_whole_phrases_only(emergency_tool: EmergencyTool) -> None:
+    assert emergency_tool.is_emergency_phrase("Please HELP me")
+    assert not emergency_tool.is_emergency_phrase("That was helpful")
+
+
+def test_matches_punctuated_phrase(emergency_tool: EmergencyTool) -> None:
+    emergency_tool.add_emergency_phrase("SOS!")
+
+    assert emergency_tool.is_emergency_phrase("sos!")
+    assert emergency_tool.is_emergency_phrase("I think... SOS! someone come")
+
+
+async def test_concurrent_call_is_blocked_by_cooldown(
+    emergency_tool: EmergencyTool,
+) -> None:
+    calls = FakeCalls()
+    connect(emergency_tool, calls)
+
+    first, second = await asyncio.gather(
+        emergency_tool.emergency_call(None, "fall", "I fell"),
+        emergency_tool.emergency_call(None, "fall", "I fell"),
+    )
+
+    assert first.startswith("🚨 EMERGENCY")
+    assert second.startswith("I just called for help")
+    assert len(calls.dialed) == 3
+
+
+async def test_all_failed_clears_cooldown(emergency_tool: EmergencyTool) -> None:
+    contacts = emergency_tool.emergency_contacts
+    calls = FakeCalls(failing=[contacts[p] for p in ("primary", "secondary", "doctor")])
+    connect(emergency_tool, calls)
+
+    result = await emergency_tool.emergency_call(None)
+
+    assert result.startswith("I tried to call for help")
+    assert not emergency_tool.is_in_cooldown()
+
+    # Nobody was reached, so a retry dials everyone again
+    await emergency_tool.emergency_call(None)
+    assert len(calls.dialed) == 6
+
+
+async def test_partial_success_keeps_cooldown(emergency_tool: EmergencyTool) -> None:
+    calls = FakeCalls(failing=[emergency_tool.emergency_contacts["secondary"]])
+    connect(emergency_tool, calls)
+
+    result = await emergency_tool.emergency_call(None)
+
+    assert result.startswith("🚨 EMERGENCY")
+    assert emergency_tool.is_in_cooldown()
+
+    retry = await emergency_tool.emergency_call(None)
+    assert retry.startswith("I just called for help")
+    assert len(calls.dialed) == 3
+
+
+async def test_dials_every_family_contact(emergency_tool: EmergencyTool) -> None:
+    calls = FakeCalls()
+    connect(emergency_tool, calls)
+
+    await emergency_tool.emergency_call(None)
+
+    contacts = emergency_tool.emergency_contacts
+    assert sorted(calls.dialed) == sorted(
+        contacts[p] for p in ("primary", "secondary", "doctor")
+    )
+
+
+async def test_failed_contact_does_not_hide_others(
+    emergency_tool: EmergencyTool,
+) -> None:
+    calls = FakeCalls(failing=[emergency_tool.emergency_contacts["doctor"]])
+    connect(emergency_tool, calls)
+
+    result = await emergency_tool.emergency_call(None)
+
+    assert len(calls.dialed) == 3
+    assert "Wesley (your son)" in result
+
+
+async def test_names_family_when_primary_fails(emergency_tool: EmergencyTool) -> None:
+    calls = FakeCalls(failing=[emergency_tool.emergency_contacts["primary"]])
+    connect(emergency_tool, calls)
+
+    result = await emergency_tool.emergency_call(None)
+
+    assert "your family" in result
+    assert "Wesley" not in result
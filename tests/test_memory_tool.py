@@ -0,0 +1,60 @@
+import asyncio
+import json
+import os
+import stat
+
+
+def read_personal_info(memory_tools, user_id: str) -> dict:
+    with open(memory_tools._get_metadata_file(user_id), encoding="utf-8") as f:
+        return json.load(f)["personal_info"]
+
+
+async def test_store_keeps_fields_written_by_another_process(
+    memory_tools, mock_context
+) -> None:
+    context = mock_context("shared_user")
+    await memory_tools.store_personal_info(context, "name", "Maggie")
+
+    # Another worker adds a field behind this instance's back
+    path = memory_tools._get_metadata_file("shared_user")
+    with open(path, encoding="utf-8") as f:
+        metadata = json.load(f)
+    metadata["personal_info"]["occupation"] = "teacher"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    await memory_tools.store_personal_info(context, "birthdate", "1932")
+
+    assert read_personal_info(memory_tools, "shared_user") == {
+        "name": "Maggie",
+        "occupation": "teacher",
+        "birthdate": "1932",
+    }
+
+
+async def test_concurrent_first_stores_keep_every_field(
+    memory_tools, mock_context
+) -> None:
+    context = mock_context("first_time_user")
+
+    await asyncio.gather(
+        memory_tools.store_personal_info(context, "name", "Maggie"),
+        memory_tools.store_personal_info(context, "hometown", "Dayton"),
+    )
+
+    assert read_personal_info(memory_tools, "first_time_user") == {
+        "name": "Maggie",
+        "hometown": "Dayton",
+    }
+
+
+async def test_saved_metadata_is_not_private(memory_tools, mock_context) -> None:
+    context = mock_context("mode_user")
+
+    await memory_tools.store_personal_info(context, "name", "Maggie")
+    await memory_tools.store_personal_info(context, "hometown", "Dayton")
+
+    path = memory_tools._get_metadata_file("mode_user")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644